@@ -2,18 +2,125 @@
 import os
 import re
 import json
-import time
 import html
+import functools
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 try:
     from zoneinfo import ZoneInfo
 except Exception:
     ZoneInfo = None  # Fallback, wenn nicht verfügbar
+try:
+    import orjson
+except Exception:
+    orjson = None  # Fallback auf json
+try:
+    import ahocorasick
+except Exception:
+    ahocorasick = None  # Fallback auf Regex
+try:
+    import requests_cache
+except Exception:
+    requests_cache = None  # ohne HTTP-Cache
+try:
+    import ijson
+except Exception:
+    ijson = None  # Fallback auf resp.json()
 
 COUNTRY = "de"
 ADZUNA_BASE = f"https://api.adzuna.com/v1/api/jobs/{COUNTRY}/search"
+FETCH_WORKERS = 8
+CACHE_DIR = ".cache"  # bewusst nicht unter site/, das wird veröffentlicht
+_WS_RE = re.compile(r"\s+")
+_NUM_RE = re.compile(r"[^0-9]")
+_THOUSANDS_TRANS = str.maketrans(",", ".")
+_REMOTE_RE = re.compile(r"remote|homeoffice|home\s*office|hybrid|teil-remote", re.IGNORECASE)
+# Felder aus der Adzuna-Antwort, die build_job_obj tatsächlich braucht
+RESULT_FIELDS = (
+    "id", "title", "company", "location", "created", "redirect_url", "description",
+    "contract_type", "contract_time", "category", "salary_min", "salary_max", "salary_is_predicted",
+)
+JOB_JSON_FIELDS = (
+    "id", "title", "company", "location", "areas", "created", "created_local",
+    "redirect_url", "description", "contract_type", "contract_time", "category",
+    "salary_min", "salary_max", "salary_is_predicted", "source",
+    "is_remote_guess", "meets_salary", "keyword", "exclude_reason",
+)
+SALARY_RANK = {True: 2, None: 1, False: 0}
+
+CARD_TMPL = """
+        <article class="card">
+          <h3>{title}</h3>
+          <p class="meta">{company} · {location}{remote}</p>
+          <p class="meta">Quelle: Adzuna · Erstellt: {created} · Schlagwort: {keyword}</p>
+          <p class="salary">{salary_txt} {badge}</p>
+          <p class="desc">{desc}</p>
+          <p><a class="btn" href="{redirect}" target="_blank" rel="noopener">Zur Ausschreibung</a></p>
+        </article>
+        """
+
+HEADER_TMPL = """<!doctype html>
+<html lang="de">
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1">
+  <title>Jobs – Auto-Suche für {home_city}</title>
+  <style>
+    :root {{
+      --bg: #0b0f14; --fg: #e6edf3; --muted:#9fb1c3; --card:#121821; --pri:#2ea043; --warn:#d29922; --bad:#f85149; --pill:#3b82f6;
+    }}
+    body {{ background: var(--bg); color: var(--fg); font-family: system-ui, -apple-system, Segoe UI, Roboto, Arial, sans-serif; margin:0; }}
+    header {{ padding: 24px 16px; border-bottom: 1px solid #1f2937; }}
+    header h1 {{ margin: 0 0 6px 0; font-size: 22px; }}
+    header p {{ margin: 2px 0; color: var(--muted); }}
+    main {{ padding: 16px; max-width: 1100px; margin: 0 auto; }}
+    .stats, .legend {{ color: var(--muted); margin-bottom: 12px; }}
+    .grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(300px, 1fr)); gap: 16px; }}
+    .card {{ background: var(--card); border: 1px solid #1f2937; border-radius: 10px; padding: 14px; }}
+    .card h3 {{ margin: 0 0 6px 0; font-size: 18px; }}
+    .meta {{ margin: 0; color: var(--muted); font-size: 13px; }}
+    .salary {{ margin: 8px 0; }}
+    .desc {{ color: var(--fg); }}
+    .btn {{ display:inline-block; background: #2563eb; color: white; padding: 8px 12px; border-radius: 8px; text-decoration: none; }}
+    .badge {{ margin-left: 8px; padding: 2px 8px; border-radius: 999px; font-size: 12px; vertical-align: middle; }}
+    .badge.good {{ background: rgba(46,160,67,.18); color: #3fb950; }}
+    .badge.neutral {{ background: rgba(210,153,34,.18); color: #d29922; }}
+    .badge.warn {{ background: rgba(248,81,73,.18); color: #f85149; }}
+    .pill {{ margin-left: 6px; background: rgba(59,130,246,.18); color: #60a5fa; padding: 2px 6px; border-radius: 999px; font-size: 12px; }}
+    footer {{ padding: 20px 16px; color: var(--muted); text-align: center; }}
+    ul.inline {{ padding-left: 16px; }}
+    a, a:visited {{ color: #7aa2ff; }}
+  </style>
+</head>
+<body>
+  <header>
+    <h1>Jobsuche: {home_city} (+{radius_km} km) – ohne {exclude_city}</h1>
+    <p>Letzte Aktualisierung: {now_local} · Mindestgehalt: €{salary_min_year:,} p.a. · Quellen: Adzuna</p>
+    <p>Keywords: {keywords} · Ausschlüsse: {exclude_terms}</p>
+  </header>
+  <main>
+    <div class="stats">
+      <p>Gefunden (nach Filter): <strong>{total}</strong> · Rohdaten: site/data/jobs.json</p>
+      <p>Treffer pro Keyword:</p>
+      <ul class="inline">{keyword_summary}</ul>
+      <p class="legend">Hinweis: Anzeigen ohne Gehaltsangabe werden angezeigt und entsprechend gekennzeichnet.</p>
+    </div>
+    <section class="grid">
+      """
+
+FOOTER_TMPL = """
+    </section>
+  </main>
+  <footer>
+    Generiert automatisch (GitHub Actions). © {year} · Profil von Marco Dinkel
+  </footer>
+</body>
+</html>
+"""
 
 def getenv(name, default=None):
     v = os.getenv(name)
@@ -31,7 +138,7 @@ def parse_int_flexible(value, default):
         return int(float(value))
     s = str(value).strip()
     # entferne alles außer Ziffern
-    s = re.sub(r"[^0-9]", "", s)
+    s = _NUM_RE.sub("", s)
     if not s:
         return default
     try:
@@ -42,24 +149,36 @@ def parse_int_flexible(value, default):
 def normalize(s):
     return (s or "").strip()
 
-def contains_any(text, terms):
-    if not text:
-        return False
-    t = text.casefold()
-    return any(term.casefold() in t for term in terms)
+@functools.lru_cache(maxsize=2048)
+def _esc(s):
+    # Firmen, Orte, Zeitstempel und Schlagwörter wiederholen sich über Karten und Kopfbereich;
+    # html.escape (str.replace in C) ist schneller als str.translate mit Ersetzungstabelle
+    return html.escape(s or "")
 
 def clean_text(s, max_len=350):
     if not s:
         return ""
-    s = re.sub(r"\s+", " ", s).strip()
-    s = html.escape(s)
+    s = _WS_RE.sub(" ", s).strip()
+    # erst kürzen, dann escapen: so wird keine Entity (&amp; …) abgeschnitten
     if len(s) > max_len:
         s = s[: max_len - 1].rstrip() + "…"
-    return s
+    return html.escape(s)
 
 def ensure_dir(p):
     Path(p).mkdir(parents=True, exist_ok=True)
 
+def public_job(job):
+    return {k: job[k] for k in JOB_JSON_FIELDS if k in job}
+
+def write_json(p, data):
+    # Maschinenlesbares Artefakt: kompakt, ohne Pretty-Printing
+    # orjson kodiert direkt zu UTF-8-Bytes; beide Wege schreiben in einem Stück
+    if orjson is not None:
+        data_bytes = orjson.dumps(data)
+    else:
+        data_bytes = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    Path(p).write_bytes(data_bytes)
+
 def get_berlin_tz():
     if ZoneInfo is None:
         return None
@@ -68,7 +187,34 @@ def get_berlin_tz():
     except Exception:
         return None
 
-def fetch_adzuna_page(keyword, page, cfg):
+BERLIN_TZ = get_berlin_tz()
+
+def http_cache_enabled(cfg):
+    return requests_cache is not None and cfg["HTTP_CACHE_HOURS"] > 0
+
+def build_session(cfg):
+    # Keep-Alive + Connection-Pool für alle Threads; 429/5xx werden mit Backoff wiederholt
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+    if http_cache_enabled(cfg):
+        # Antworten lokal zwischenspeichern; Zugangsdaten gehen weder in den Cache-Key noch in den Cache.
+        # Abgelaufene Einträge bleiben liegen und werden per ETag revalidiert (304 statt voller Antwort).
+        ensure_dir(CACHE_DIR)
+        session = requests_cache.CachedSession(
+            str(Path(CACHE_DIR) / "adzuna_cache"),
+            backend="sqlite",
+            expire_after=timedelta(hours=cfg["HTTP_CACHE_HOURS"]),
+            allowable_methods=("GET",),
+            ignored_parameters=["app_id", "app_key"],
+        )
+    else:
+        session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = "MarcoJobBot/1.0 (+GitHub Actions)"
+    return session
+
+def adzuna_request(keyword, page, cfg):
     params = {
         "app_id": cfg["ADZUNA_APP_ID"],
         "app_key": cfg["ADZUNA_APP_KEY"],
@@ -80,29 +226,86 @@ def fetch_adzuna_page(keyword, page, cfg):
         "what_exclude": "Zeitarbeit",
         # Adzuna nutzt die Seitenzahl im Pfad (…/search/{page}), daher kein zusätzliches "page" hier nötig.
     }
-    url = f"{ADZUNA_BASE}/{page}"
-    headers = {"User-Agent": "MarcoJobBot/1.0 (+GitHub Actions)"}
-    resp = requests.get(url, params=params, headers=headers, timeout=25)
-    resp.raise_for_status()
-    return resp.json()
-
-def job_city_mentions_excluded(job, exclude_city):
-    if not exclude_city:
+    return f"{ADZUNA_BASE}/{page}", params
+
+def etag_key(url, params):
+    # vollständige Anfrage ohne Zugangsdaten: andere Stadt/Umkreis/… ergibt einen anderen Eintrag
+    public = {k: v for k, v in params.items() if k not in ("app_id", "app_key")}
+    return requests.Request("GET", url, params=public).prepare().url
+
+def load_etags():
+    p = Path(CACHE_DIR) / "etags.json"
+    try:
+        with open(p, encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def save_etags(etags):
+    ensure_dir(CACHE_DIR)
+    write_json(Path(CACHE_DIR) / "etags.json", etags)
+
+def trim_result(r):
+    return {k: r[k] for k in RESULT_FIELDS if k in r}
+
+def parse_results(resp):
+    if ijson is not None and not getattr(resp, "from_cache", False):
+        # results-Array direkt vom Socket parsen, ohne die ganze Seite als dict aufzubauen
+        resp.raw.decode_content = True
+        return [trim_result(r) for r in ijson.items(resp.raw, "results.item", use_float=True)]
+    return [trim_result(r) for r in resp.json().get("results", [])]
+
+def fetch_adzuna_page(session, keyword, page, cfg, etags):
+    url, params = adzuna_request(keyword, page, cfg)
+    # Conditional GET: bei 304 die zuletzt gespeicherte Antwort weiterverwenden.
+    # Eine CachedSession revalidiert selbst per ETag, dann nicht doppelt speichern.
+    use_etags = requests_cache is None or not isinstance(session, requests_cache.CachedSession)
+    key = etag_key(url, params)
+    cached = etags.get(key) if use_etags else None
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+    with session.get(url, params=params, headers=headers, timeout=25, stream=True) as resp:
+        if resp.status_code == 304 and cached:
+            return cached["results"]
+        resp.raise_for_status()
+        results = parse_results(resp)
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+    if use_etags and (etag or last_modified):
+        etags[key] = {"etag": etag, "last_modified": last_modified, "results": results}
+    return results
+
+def compile_filters(cfg):
+    # Filterbegriffe einmalig vorbereiten (Regex bzw. casefold), statt pro Job erneut
+    terms = [t for t in cfg["EXCLUDE_TERMS"] if t]
+    cfg["EXCLUDE_TERMS_CF"] = tuple(t.casefold() for t in terms)
+    # casefold -> (Position in EXCLUDE_TERMS, Begriff); bei Treffern gewinnt wie früher der erste Begriff
+    labels = {}
+    for i, (term_cf, term) in enumerate(zip(cfg["EXCLUDE_TERMS_CF"], terms)):
+        labels.setdefault(term_cf, (i, term))
+    cfg["EXCLUDE_TERM_LABELS"] = labels
+    cfg["EXCLUDE_AUTOMATON"] = None
+    if ahocorasick is not None and labels:
+        # alle Begriffe in einem linearen Durchlauf über den Text
+        automaton = ahocorasick.Automaton()
+        for term_cf, label in labels.items():
+            automaton.add_word(term_cf, label)
+        automaton.make_automaton()
+        cfg["EXCLUDE_AUTOMATON"] = automaton
+    # casefold statt re.IGNORECASE, damit z. B. "ß" auch "SS" trifft (wie im Aho-Corasick-Pfad).
+    # Lookahead, damit auch überlappende Treffer an jeder Position gefunden werden.
+    cfg["EXCLUDE_RE"] = re.compile("(?=(" + "|".join(re.escape(t) for t in labels) + "))") if labels else None
+    cfg["EXCLUDE_CITY_CF"] = (cfg["EXCLUDE_CITY"] or "").casefold()
+
+def job_city_mentions_excluded(job, city_cf):
+    # Ort, Regionen und als Fallback Titel/Beschreibung (siehe _haystack_cf)
+    if not city_cf:
         return False
-    loc = job.get("location") or {}
-    disp = normalize(loc.get("display_name"))
-    if exclude_city.casefold() in disp.casefold():
-        return True
-    area = loc.get("area") or []
-    for a in area:
-        if exclude_city.casefold() in str(a).casefold():
-            return True
-    # Fallback: Titel/Beschreibung
-    title = normalize(job.get("title"))
-    desc = normalize(job.get("description"))
-    if exclude_city.casefold() in title.casefold() or exclude_city.casefold() in desc.casefold():
-        return True
-    return False
+    return city_cf in job["_haystack_cf"]
 
 def extract_annual_salary(job):
     smin = job.get("salary_min")
@@ -154,42 +357,89 @@ def build_job_obj(raw, cfg):
     }
 
     if created_dt:
-        berlin = get_berlin_tz()
         try:
-            if berlin:
-                job["created_local"] = created_dt.astimezone(berlin).strftime("%d.%m.%Y %H:%M")
+            if BERLIN_TZ:
+                job["created_local"] = created_dt.astimezone(BERLIN_TZ).strftime("%d.%m.%Y %H:%M")
             else:
                 job["created_local"] = created_dt.strftime("%Y-%m-%d %H:%M UTC")
         except Exception:
             job["created_local"] = created_dt.strftime("%Y-%m-%d %H:%M UTC")
 
     # Heuristik Remote
-    job["is_remote_guess"] = contains_any(
-        " ".join([job["title"], job["description"]]),
-        ["remote", "homeoffice", "home office", "hybrid", "teil-remote"]
-    )
+    job["is_remote_guess"] = bool(_REMOTE_RE.search(job["title"] + " " + job["description"]))
 
     job["meets_salary"] = meets_min_salary(job, cfg["SALARY_MIN_YEAR"])
+
+    # Einmal casefolden für den Stadt-Ausschluss; wird nicht ins JSON geschrieben.
+    # "\n" als Trenner, damit ein Stadtname mit Leerzeichen nicht über zwei Felder hinweg trifft
+    job["_haystack_cf"] = "\n".join(
+        [job["location"], *[str(a) for a in job["areas"]], job["title"], job["description"]]
+    ).casefold()
     return job
 
 def should_exclude(job, cfg):
     # Stadt-Ausschluss
-    if cfg["EXCLUDE_CITY"] and job_city_mentions_excluded(job, cfg["EXCLUDE_CITY"]):
+    if job_city_mentions_excluded(job, cfg["EXCLUDE_CITY_CF"]):
         return True, "excluded_city"
     # Zeitarbeit & Synonyme
+    if cfg["EXCLUDE_RE"] is None:
+        return False, None
     hay = " ".join([job["title"], job["company"], job["description"]]).casefold()
-    for term in cfg["EXCLUDE_TERMS"]:
-        if term.casefold() in hay:
-            return True, f"excluded_term:{term}"
+    if cfg["EXCLUDE_AUTOMATON"] is not None:
+        hits = [label for _, label in cfg["EXCLUDE_AUTOMATON"].iter(hay)]
+    else:
+        labels = cfg["EXCLUDE_TERM_LABELS"]
+        hits = [labels[m.group(1)] for m in cfg["EXCLUDE_RE"].finditer(hay)]
+    if hits:
+        # unabhängig vom Suchverfahren: der in EXCLUDE_TERMS zuerst genannte Begriff
+        _, term = min(hits)
+        return True, f"excluded_term:{term}"
     return False, None
 
 def rank_job(job):
     # 2 (Gehalt ok) > 1 (unbekannt) > 0 (unter Minimum)
-    if job["meets_salary"] is True:
-        return 2
-    if job["meets_salary"] is None:
-        return 1
-    return 0
+    return SALARY_RANK[job["meets_salary"]]
+
+def job_sort_key(job):
+    # list.sort(key=...) ruft das genau einmal pro Job auf (decorate-sort-undecorate)
+    return (-rank_job(job), job["company"].casefold(), job["title"].casefold())
+
+def render_card(j):
+    salary_txt = "Gehaltsangabe: unbekannt"
+    try:
+        if j["salary_min"] or j["salary_max"]:
+            parts = []
+            if j["salary_min"]:
+                parts.append("min €" + format(int(float(j["salary_min"])), ",").translate(_THOUSANDS_TRANS))
+            if j["salary_max"]:
+                parts.append("max €" + format(int(float(j["salary_max"])), ",").translate(_THOUSANDS_TRANS))
+            salary_txt = " / ".join(parts) + " p.a."
+    except Exception:
+        pass
+
+    badge = ""
+    if j["meets_salary"] is True:
+        badge = '<span class="badge good">≥ Mindestgehalt</span>'
+    elif j["meets_salary"] is None:
+        badge = '<span class="badge neutral">Gehalt unbekannt</span>'
+    else:
+        badge = '<span class="badge warn">unter Mindestgehalt</span>'
+
+    remote = ' <span class="pill">Remote/HYB</span>' if j.get("is_remote_guess") else ""
+    created = j.get("created_local") or (j.get("created") or "")[:16]
+
+    return CARD_TMPL.format_map({
+        "title": html.escape(j.get("title") or ""),
+        "company": _esc(j.get("company")),
+        "location": _esc(j.get("location")),
+        "remote": remote,
+        "created": _esc(created),
+        "keyword": _esc(j.get("keyword")),
+        "salary_txt": salary_txt,
+        "badge": badge,
+        "desc": clean_text(j.get("description"), max_len=360),
+        "redirect": html.escape(j.get("redirect_url") or "#"),
+    })
 
 def main():
     cfg = {
@@ -207,34 +457,61 @@ def main():
         ]),
         "ADZUNA_MAX_PAGES": parse_int_flexible(getenv("ADZUNA_MAX_PAGES", "2"), 2),
         "RESULTS_PER_PAGE": parse_int_flexible(getenv("RESULTS_PER_PAGE", "50"), 50),
+        "HTTP_CACHE_HOURS": parse_int_flexible(getenv("HTTP_CACHE_HOURS", "6"), 6),
     }
+    compile_filters(cfg)
 
     # Minimal-Config-Log (ohne Secrets)
     print("[INFO] Effektive Konfiguration:")
     print(f"  HOME_CITY={cfg['HOME_CITY']}, EXCLUDE_CITY={cfg['EXCLUDE_CITY']}, RADIUS_KM={cfg['RADIUS_KM']}")
     print(f"  SALARY_MIN_YEAR={cfg['SALARY_MIN_YEAR']}, ADZUNA_MAX_PAGES={cfg['ADZUNA_MAX_PAGES']}, RESULTS_PER_PAGE={cfg['RESULTS_PER_PAGE']}")
+    if http_cache_enabled(cfg):
+        cache_state = "aktiv"
+    elif requests_cache is not None:
+        cache_state = "deaktiviert"
+    else:
+        cache_state = "requests-cache fehlt"
+    print(f"  HTTP_CACHE_HOURS={cfg['HTTP_CACHE_HOURS']} ({cache_state})")
     print(f"  KEYWORDS={cfg['KEYWORDS']}")
     print(f"  EXCLUDE_TERMS={cfg['EXCLUDE_TERMS']}")
 
     if not cfg["ADZUNA_APP_ID"] or not cfg["ADZUNA_APP_KEY"]:
         raise RuntimeError("ADZUNA_APP_ID / ADZUNA_APP_KEY fehlen als Secrets/Env.")
 
-    all_raw = []
+    kept = []
+    excluded = []
     per_keyword_count = {}
     seen_ids = set()
 
-    for kw in cfg["KEYWORDS"]:
-        kw = kw.strip()
-        if not kw:
-            continue
-        total_for_kw = 0
-        for page in range(1, cfg["ADZUNA_MAX_PAGES"] + 1):
+    # doppelte Schlagwörter nur einmal abfragen (Reihenfolge bleibt erhalten)
+    keywords = list(dict.fromkeys(kw.strip() for kw in cfg["KEYWORDS"] if kw.strip()))
+    pages = range(1, cfg["ADZUNA_MAX_PAGES"] + 1)
+
+    # Alle Seiten parallel holen (reines Netzwerk-I/O), danach in fester Reihenfolge auswerten
+    responses = {}
+    etags = load_etags()
+    with build_session(cfg) as session, ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        futures = {
+            pool.submit(fetch_adzuna_page, session, kw, page, cfg, etags): (kw, page)
+            for kw in keywords
+            for page in pages
+        }
+        for fut in as_completed(futures):
+            kw, page = futures[fut]
             try:
-                data = fetch_adzuna_page(kw, page, cfg)
+                responses[(kw, page)] = fut.result()
             except Exception as e:
                 print(f"[WARN] Adzuna-Request fehlgeschlagen für '{kw}' Seite {page}: {e}")
-                break
-            results = data.get("results", [])
+                responses[(kw, page)] = None
+    # nur Einträge der aktuellen Suche behalten
+    wanted = {etag_key(*adzuna_request(kw, page, cfg)) for kw in keywords for page in pages}
+    save_etags({k: v for k, v in etags.items() if k in wanted})
+
+    # Abrufen, Aufbereiten und Filtern in einem Durchlauf; Rohdaten werden sofort freigegeben
+    for kw in keywords:
+        total_for_kw = 0
+        for page in pages:
+            results = responses.pop((kw, page))
             if not results:
                 break
             for r in results:
@@ -242,24 +519,18 @@ def main():
                 if rid in seen_ids:
                     continue
                 seen_ids.add(rid)
-                all_raw.append((kw, r))
-                total_for_kw += 1
-            time.sleep(0.3)  # Rate-Limit-Schonung
+                job = build_job_obj(r, cfg)
+                job["keyword"] = kw
+                ex, reason = should_exclude(job, cfg)
+                if ex:
+                    job["exclude_reason"] = reason
+                    excluded.append(job)
+                else:
+                    kept.append(job)
+                    total_for_kw += 1
         per_keyword_count[kw] = total_for_kw
 
-    kept = []
-    excluded = []
-    for kw, raw in all_raw:
-        job = build_job_obj(raw, cfg)
-        ex, reason = should_exclude(job, cfg)
-        job["keyword"] = kw
-        if ex:
-            job["exclude_reason"] = reason
-            excluded.append(job)
-        else:
-            kept.append(job)
-
-    kept.sort(key=lambda j: (-rank_job(j), j["company"].casefold(), j["title"].casefold()))
+    kept.sort(key=job_sort_key)
 
     ensure_dir("site")
     ensure_dir("site/data")
@@ -274,136 +545,51 @@ def main():
         "exclude_terms": cfg["EXCLUDE_TERMS"],
         "sources": ["Adzuna"],
         "counts": {
-            "fetched_total": len(all_raw),
+            "fetched_total": len(kept) + len(excluded),
             "kept": len(kept),
             "excluded": len(excluded),
             "per_keyword": per_keyword_count,
         },
-        "jobs": kept,
+        "jobs": [public_job(j) for j in kept],
     }
-    with open("site/data/jobs.json", "w", encoding="utf-8") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    write_json("site/data/jobs.json", output)
 
     # HTML bauen
     try:
-        berlin = get_berlin_tz()
         now_dt = datetime.now(timezone.utc)
-        if berlin:
-            now_local = now_dt.astimezone(berlin).strftime("%d.%m.%Y %H:%M")
+        if BERLIN_TZ:
+            now_local = now_dt.astimezone(BERLIN_TZ).strftime("%d.%m.%Y %H:%M")
         else:
             now_local = now_dt.strftime("%Y-%m-%d %H:%M UTC")
     except Exception:
         now_local = datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
 
     total = len(kept)
-    kept_cards = []
-    for j in kept:
-        salary_txt = "Gehaltsangabe: unbekannt"
-        try:
-            if j["salary_min"] or j["salary_max"]:
-                parts = []
-                if j["salary_min"]:
-                    parts.append(f"min €{int(float(j['salary_min'])):,}".replace(",", "."))
-                if j["salary_max"]:
-                    parts.append(f"max €{int(float(j['salary_max'])):,}".replace(",", "."))
-                salary_txt = " / ".join(parts) + " p.a."
-        except Exception:
-            pass
-
-        badge = ""
-        if j["meets_salary"] is True:
-            badge = '<span class="badge good">≥ Mindestgehalt</span>'
-        elif j["meets_salary"] is None:
-            badge = '<span class="badge neutral">Gehalt unbekannt</span>'
-        else:
-            badge = '<span class="badge warn">unter Mindestgehalt</span>'
-
-        remote = ' <span class="pill">Remote/HYB</span>' if j.get("is_remote_guess") else ""
-        created = j.get("created_local") or (j.get("created") or "")[:16]
-        desc = clean_text(j.get("description"), max_len=360)
-        title = html.escape(j.get("title") or "")
-        company = html.escape(j.get("company") or "")
-        location = html.escape(j.get("location") or "")
-        redirect = html.escape(j.get("redirect_url") or "#")
-        keyword = html.escape(j.get("keyword") or "")
-
-        card = f"""
-        <article class="card">
-          <h3>{title}</h3>
-          <p class="meta">{company} · {location}{remote}</p>
-          <p class="meta">Quelle: Adzuna · Erstellt: {html.escape(created)} · Schlagwort: {keyword}</p>
-          <p class="salary">{salary_txt} {badge}</p>
-          <p class="desc">{desc}</p>
-          <p><a class="btn" href="{redirect}" target="_blank" rel="noopener">Zur Ausschreibung</a></p>
-        </article>
-        """
-        kept_cards.append(card)
-
     keyword_summary = "".join(
-        f"<li><strong>{html.escape(k)}</strong>: {v}</li>" for k, v in per_keyword_count.items()
+        f"<li><strong>{_esc(k)}</strong>: {v}</li>" for k, v in per_keyword_count.items()
     )
-    exclude_terms_html = ", ".join(html.escape(t) for t in cfg["EXCLUDE_TERMS"])
+    exclude_terms_html = ", ".join(_esc(t) for t in cfg["EXCLUDE_TERMS"])
 
-    html_doc = f"""<!doctype html>
-<html lang="de">
-<head>
-  <meta charset="utf-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1">
-  <title>Jobs – Auto-Suche für {html.escape(cfg['HOME_CITY'])}</title>
-  <style>
-    :root {{
-      --bg: #0b0f14; --fg: #e6edf3; --muted:#9fb1c3; --card:#121821; --pri:#2ea043; --warn:#d29922; --bad:#f85149; --pill:#3b82f6;
-    }}
-    body {{ background: var(--bg); color: var(--fg); font-family: system-ui, -apple-system, Segoe UI, Roboto, Arial, sans-serif; margin:0; }}
-    header {{ padding: 24px 16px; border-bottom: 1px solid #1f2937; }}
-    header h1 {{ margin: 0 0 6px 0; font-size: 22px; }}
-    header p {{ margin: 2px 0; color: var(--muted); }}
-    main {{ padding: 16px; max-width: 1100px; margin: 0 auto; }}
-    .stats, .legend {{ color: var(--muted); margin-bottom: 12px; }}
-    .grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(300px, 1fr)); gap: 16px; }}
-    .card {{ background: var(--card); border: 1px solid #1f2937; border-radius: 10px; padding: 14px; }}
-    .card h3 {{ margin: 0 0 6px 0; font-size: 18px; }}
-    .meta {{ margin: 0; color: var(--muted); font-size: 13px; }}
-    .salary {{ margin: 8px 0; }}
-    .desc {{ color: var(--fg); }}
-    .btn {{ display:inline-block; background: #2563eb; color: white; padding: 8px 12px; border-radius: 8px; text-decoration: none; }}
-    .badge {{ margin-left: 8px; padding: 2px 8px; border-radius: 999px; font-size: 12px; vertical-align: middle; }}
-    .badge.good {{ background: rgba(46,160,67,.18); color: #3fb950; }}
-    .badge.neutral {{ background: rgba(210,153,34,.18); color: #d29922; }}
-    .badge.warn {{ background: rgba(248,81,73,.18); color: #f85149; }}
-    .pill {{ margin-left: 6px; background: rgba(59,130,246,.18); color: #60a5fa; padding: 2px 6px; border-radius: 999px; font-size: 12px; }}
-    footer {{ padding: 20px 16px; color: var(--muted); text-align: center; }}
-    ul.inline {{ padding-left: 16px; }}
-    a, a:visited {{ color: #7aa2ff; }}
-  </style>
-</head>
-<body>
-  <header>
-    <h1>Jobsuche: {html.escape(cfg['HOME_CITY'])} (+{cfg['RADIUS_KM']} km) – ohne {html.escape(cfg['EXCLUDE_CITY'])}</h1>
-    <p>Letzte Aktualisierung: {html.escape(now_local)} · Mindestgehalt: €{cfg['SALARY_MIN_YEAR']:,} p.a. · Quellen: Adzuna</p>
-    <p>Keywords: {", ".join(html.escape(k) for k in cfg["KEYWORDS"])} · Ausschlüsse: {html.escape(exclude_terms_html)}</p>
-  </header>
-  <main>
-    <div class="stats">
-      <p>Gefunden (nach Filter): <strong>{total}</strong> · Rohdaten: site/data/jobs.json</p>
-      <p>Treffer pro Keyword:</p>
-      <ul class="inline">{keyword_summary}</ul>
-      <p class="legend">Hinweis: Anzeigen ohne Gehaltsangabe werden angezeigt und entsprechend gekennzeichnet.</p>
-    </div>
-    <section class="grid">
-      {''.join(kept_cards) if kept_cards else '<p>Keine passenden Anzeigen gefunden.</p>'}
-    </section>
-  </main>
-  <footer>
-    Generiert automatisch (GitHub Actions). © {datetime.now().year} · Profil von Marco Dinkel
-  </footer>
-</body>
-</html>
-"""
     with open("site/index.html", "w", encoding="utf-8") as f:
-        f.write(html_doc)
-
-    print(f"[OK] Rohanzeigen: {len(all_raw)}, nach Filtern: {len(kept)}. HTML & JSON erzeugt.")
+        f.write(HEADER_TMPL.format(
+            home_city=_esc(cfg["HOME_CITY"]),
+            radius_km=cfg["RADIUS_KM"],
+            exclude_city=_esc(cfg["EXCLUDE_CITY"]),
+            now_local=_esc(now_local),
+            salary_min_year=cfg["SALARY_MIN_YEAR"],
+            keywords=", ".join(_esc(k) for k in cfg["KEYWORDS"]),
+            exclude_terms=_esc(exclude_terms_html),
+            total=total,
+            keyword_summary=keyword_summary,
+        ))
+        # Karten einzeln schreiben statt das ganze Dokument im Speicher zusammenzusetzen
+        for j in kept:
+            f.write(render_card(j))
+        if not kept:
+            f.write("<p>Keine passenden Anzeigen gefunden.</p>")
+        f.write(FOOTER_TMPL.format(year=datetime.now().year))
+
+    print(f"[OK] Rohanzeigen: {len(kept) + len(excluded)}, nach Filtern: {len(kept)}. HTML & JSON erzeugt.")
 
 if __name__ == "__main__":
     main()